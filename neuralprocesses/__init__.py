@@ -9,11 +9,14 @@ def _dispatch(f=None, **kw_args):
     if f is None:
         return functools.partial(_dispatch, **kw_args)
 
-    if f.__name__ in {"code", "code_track", "recode"}:
+    # The check for `root` is a development-time assertion which costs an extra
+    # function call and a dictionary lookup on every coding call, which is the hottest
+    # path in the library, so strip it when Python is run with `-O`.
+    if f.__name__ in {"code", "code_track", "recode"} and __debug__:
 
         @functools.wraps(f)
         def f_wrapped(*args, **kw_args):
-            if "root" not in kw_args or not kw_args["root"]:
+            if not kw_args.get("root"):
                 raise RuntimeError(
                     "Did you not set `root = True` at the root coding call, "
                     "or did you forget to propagate `**kw_args`?"
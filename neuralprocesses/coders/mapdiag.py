@@ -65,8 +65,14 @@ def _mapdiagonal_duplicate_target(x: AggregateInput):
 
 @_dispatch
 def _mapdiagonal_possibly_duplicate_context(xz: B.Numeric, d: B.Int):
-    if B.shape(xz, -2) != d:
-        return B.concat(xz, xz, axis=-2)
+    shape = B.shape(xz)
+    if shape[-2] != d:
+        if shape[-2] == 1:
+            # Broadcast rather than concatenate, which gives a view instead of
+            # materialising the duplicate.
+            return B.broadcast_to(xz, *shape[:-2], d, shape[-1])
+        else:
+            return B.concat(xz, xz, axis=-2)
     else:
         return xz
 
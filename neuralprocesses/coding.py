@@ -13,6 +13,28 @@ __all__ = [
     "recode_stochastic",
 ]
 
+_code_specialised_cache = {}
+
+
+def _code_specialised(coder):
+    # Scanning all methods is far too expensive to do at every call, so cache the
+    # outcome per coder type. The cache may miss specialised implementations that are
+    # registered after the first call for a type, but this check is only a safety
+    # net: dispatch itself always prefers a specialised implementation.
+    try:
+        return _code_specialised_cache[type(coder)]
+    except KeyError:
+        specialised = any(
+            [
+                isinstance(coder, s.types[0])
+                and issubclass(s.types[0], object)
+                and not issubclass(object, s.types[0])
+                for s in code.methods
+            ]
+        )
+        _code_specialised_cache[type(coder)] = specialised
+        return specialised
+
 
 @_dispatch
 def code(coder, xz, z, x, **kw_args):
@@ -29,14 +51,7 @@ def code(coder, xz, z, x, **kw_args):
     Returns:
         tuple[input, tensor]: New encoding.
     """
-    if any(
-        [
-            isinstance(coder, s.types[0])
-            and issubclass(s.types[0], object)
-            and not issubclass(object, s.types[0])
-            for s in code.methods
-        ]
-    ):
+    if _code_specialised(coder):
         raise RuntimeError(
             f"Dispatched to fallback implementation for `code`, but specialised "
             f"implementation are available. The arguments are "
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import List, Optional
 
 import lab as B
@@ -23,6 +24,12 @@ class Discretisation:
         margin (float, optional): Leave this much space around the most extremal points.
             Defaults to `0.1`.
         dim (int, optional): Dimensionality of the inputs.
+        cache_size (int, optional): Cache up to this many grids, reusing a cached
+            grid whenever the extremal points of the inputs snap to the same grid.
+            Since grids are snapped to multiples of the resolution, inputs with
+            nearly identical ranges share a grid, which skips the grid construction
+            and device transfer. The cache requires eager execution. Defaults to `0`,
+            which disables caching.
 
     Attributes:
         resolution (float): Resolution of the discretisation. Equal to the inverse of
@@ -31,14 +38,17 @@ class Discretisation:
             number.
         margin (float): Leave this much space around the most extremal points.
         dim (int): Dimensionality of the inputs.
+        cache_size (int): Cache up to this many grids.
     """
 
-    def __init__(self, points_per_unit, multiple=1, margin=0.1, dim=None):
+    def __init__(self, points_per_unit, multiple=1, margin=0.1, dim=None, cache_size=0):
         self.points_per_unit = points_per_unit
         self.resolution = 1 / self.points_per_unit
         self.multiple = multiple
         self.margin = margin
         self.dim = dim
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
 
     def discretise_1d(self, *args, margin):
         """Perform the discretisation for one-dimensional inputs.
@@ -73,10 +83,29 @@ class Discretisation:
         # Snap to the nearest grid point. We accounted for this above.
         grid_start = B.round(grid_start / self.resolution) * self.resolution
 
-        # Produce the grid.
         b = batch(args[0], 2)
+
+        # Since `grid_start` is snapped to the resolution and `n` to the multiple,
+        # inputs with nearly identical ranges produce identical grids, so the grid can
+        # be cached on the snapped values. Reading out the scalars forces evaluation,
+        # hence caching is only performed in eager mode.
+        if self.cache_size:
+            key = (
+                float(grid_start),
+                int(n),
+                str(B.dtype(args[0])),
+                tuple(b),
+                str(B.device(args[0])),
+            )
+            try:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            except KeyError:
+                pass
+
+        # Produce the grid.
         with B.on_device(args[0]):
-            return B.tile(
+            grid = B.tile(
                 B.expand_dims(
                     B.linspace(
                         B.dtype(args[0]),
@@ -93,6 +122,13 @@ class Discretisation:
                 1,
             )
 
+        if self.cache_size:
+            self._cache[key] = grid
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return grid
+
     def __call__(self, *args, margin=None, **kw_args):
         """Perform the discretisation for multi-dimensional inputs.
 
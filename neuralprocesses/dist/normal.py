@@ -90,7 +90,17 @@ class MultiOutputNormal(AbstractMultiOutputDistribution):
     @property
     def vectorised_normal(self):
         """:class:`stheno.Normal`: Underlying vectorised multivariate normal."""
-        return Normal(self._mean, _possibly_densify_variance(self._var + self._noise))
+        # The distribution is immutable, and constructing the normal may densify the
+        # variance, so construct it only once. Accessing the mean, the marginal
+        # variances, the log-pdf, and samples then also shares one structured
+        # variance, including any Cholesky factorisation cached on it.
+        try:
+            return self._vectorised_normal
+        except AttributeError:
+            self._vectorised_normal = Normal(
+                self._mean, _possibly_densify_variance(self._var + self._noise)
+            )
+            return self._vectorised_normal
 
     @property
     def noiseless(self):
@@ -193,7 +203,13 @@ class MultiOutputNormal(AbstractMultiOutputDistribution):
             return B.stack(*logpdfs, axis=-1)
 
     @_dispatch
-    def sample(self, state: B.RandomState, num: Union[B.Int, None] = None):
+    def sample(
+        self,
+        state: B.RandomState,
+        num: Union[B.Int, None] = None,
+        *,
+        jitter_schedule=None,
+    ):
         def f(sample):
             # Put the sample dimension first.
             perm = list(range(B.rank(sample)))
@@ -208,12 +224,32 @@ class MultiOutputNormal(AbstractMultiOutputDistribution):
             )
             return sample
 
-        return _map_sample_output(f, self.vectorised_normal.sample(state, num or 1))
+        if jitter_schedule is None:
+            return _map_sample_output(f, self.vectorised_normal.sample(state, num or 1))
+
+        # Attempt the sample with increasing amounts of regularisation. The mean and
+        # variance are already materialised, so every attempt only redoes the Cholesky
+        # decomposition and not any model evaluation.
+        epsilon_before = B.epsilon
+        try:
+            for attempt, epsilon in enumerate(jitter_schedule):
+                B.epsilon = epsilon
+                try:
+                    return _map_sample_output(
+                        f, self.vectorised_normal.sample(state, num or 1)
+                    )
+                except Exception:
+                    # If even the last epsilon of the schedule failed, there is nothing
+                    # more that we can do.
+                    if attempt == len(jitter_schedule) - 1:
+                        raise
+        finally:
+            B.epsilon = epsilon_before
 
     @_dispatch
-    def sample(self, num: Union[B.Int, None] = None):
+    def sample(self, num: Union[B.Int, None] = None, **kw_args):
         state = B.global_random_state(B.dtype(self._mean, self._var, self._noise))
-        state, sample = self.sample(state, num)
+        state, sample = self.sample(state, num, **kw_args)
         B.set_global_random_state(state)
         return sample
 
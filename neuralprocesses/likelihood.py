@@ -2,7 +2,6 @@ from functools import reduce
 from operator import mul
 
 import lab as B
-from lab.util import resolve_axis
 
 from . import _dispatch
 from .aggregate import AggregateInput, Aggregate
@@ -12,6 +11,7 @@ from .parallel import Parallel
 from .util import register_module, split, split_dimension
 
 __all__ = [
+    "softplus_noise",
     "DeterministicLikelihood",
     "HeterogeneousGaussianLikelihood",
     "LowRankGaussianLikelihood",
@@ -32,10 +32,12 @@ def _vectorise(z, num, offset=0):
         tensor: Compressed version of `z`.
         shape: Shape of the compressed dimensions before compressing.
     """
-    # Convert to positive indices for easier indexing.
-    i1 = resolve_axis(z, -num - offset)
-    i2 = resolve_axis(z, -(offset + 1)) + 1
+    # Query the shape only once: this function is called in the hot path of the
+    # likelihoods. The positive indices for easier indexing follow from the rank
+    # with plain arithmetic.
     shape = B.shape(z)
+    i1 = len(shape) - num - offset
+    i2 = len(shape) - offset
     shape_before = shape[:i1]
     shape_compressed = shape[i1:i2]
     shape_after = shape[i2:]
@@ -43,6 +45,42 @@ def _vectorise(z, num, offset=0):
     return z, shape_compressed
 
 
+def _maybe_cast(dtype, z):
+    """Cast a tensor to a data type, but skip the cast if the tensor is already of
+    that data type. A cast is a full copy of the tensor, so this saves a kernel
+    launch and a copy on the no-op path.
+
+    Args:
+        dtype (dtype or None): Data type to cast to. `None` means no cast.
+        z (tensor): Tensor to cast.
+
+    Returns:
+        tensor: `z` as `dtype`.
+    """
+    if dtype is None or B.dtype(z) == dtype:
+        return z
+    return B.cast(dtype, z)
+
+
+@_dispatch
+def softplus_noise(z, epsilon: float, dtype_lik):
+    """Transform a tensor into observation noise via `epsilon + softplus(z)`,
+    casting the result to `dtype_lik` if one is given.
+
+    The frameworks register fused implementations, which avoid materialising the
+    intermediate tensors of the three elementwise operations.
+
+    Args:
+        z (tensor): Tensor to transform.
+        epsilon (float): Smallest allowable variance.
+        dtype_lik (dtype or None): Data type of the likelihood.
+
+    Returns:
+        tensor: Observation noise.
+    """
+    return _maybe_cast(dtype_lik, epsilon + B.softplus(z))
+
+
 class AbstractLikelihood:
     """A likelihood."""
 
@@ -63,11 +101,7 @@ def code(
     **kw_args,
 ):
     d = data_dims(xz)
-
-    if dtype_lik:
-        z = B.cast(dtype_lik, z)
-
-    return xz, Dirac(z, d)
+    return xz, Dirac(_maybe_cast(dtype_lik, z), d)
 
 
 @register_module
@@ -102,12 +136,11 @@ def code(
     dtype_lik=None,
     **kw_args,
 ):
-    mean, noise, shape = _code_het(coder, xz, z)
+    mean, noise, shape = _code_het(coder, xz, z, dtype_lik)
 
-    # Cast parameters to the right data type.
-    if dtype_lik:
-        mean = B.cast(dtype_lik, mean)
-        noise = B.cast(dtype_lik, noise)
+    # Cast the mean to the right data type. The noise has already been cast by the
+    # fused noise transform.
+    mean = _maybe_cast(dtype_lik, mean)
     return xz, MultiOutputNormal.diagonal(mean, noise, shape)
 
 
@@ -116,9 +149,10 @@ def _code_het(
     coder: HeterogeneousGaussianLikelihood,
     xz: AggregateInput,
     z: Aggregate,
+    dtype_lik,
 ):
     means, noises, shapes = zip(
-        *[_code_het(coder, xzi, zi) for (xzi, _), zi in zip(xz, z)]
+        *[_code_het(coder, xzi, zi, dtype_lik) for (xzi, _), zi in zip(xz, z)]
     )
 
     # Concatenate into one big Gaussian.
@@ -130,7 +164,7 @@ def _code_het(
 
 
 @_dispatch
-def _code_het(coder: HeterogeneousGaussianLikelihood, xz, z: B.Numeric):
+def _code_het(coder: HeterogeneousGaussianLikelihood, xz, z: B.Numeric, dtype_lik):
     d = data_dims(xz)
     dim_y = B.shape(z, -d - 1) // 2
 
@@ -142,7 +176,7 @@ def _code_het(coder: HeterogeneousGaussianLikelihood, xz, z: B.Numeric):
 
     # Transform into parameters.
     mean = z_mean
-    noise = coder.epsilon + B.softplus(z_noise)
+    noise = softplus_noise(z_noise, coder.epsilon, dtype_lik)
 
     return mean, noise, shape
 
@@ -182,21 +216,25 @@ def code(
     dtype_lik=None,
     **kw_args,
 ):
-    mean, var_factor, noise, shape = _lowrank(coder, xz, z)
+    mean, var_factor, noise, shape = _lowrank(coder, xz, z, dtype_lik)
 
-    # Cast the parameters before constructing the distribution.
-    if dtype_lik:
-        mean = B.cast(dtype_lik, mean)
-        var_factor = B.cast(dtype_lik, var_factor)
-        noise = B.cast(dtype_lik, noise)
+    # Cast the parameters before constructing the distribution. The noise has already
+    # been cast by the fused noise transform.
+    mean = _maybe_cast(dtype_lik, mean)
+    var_factor = _maybe_cast(dtype_lik, var_factor)
 
     return xz, MultiOutputNormal.lowrank(mean, var_factor, noise, shape)
 
 
 @_dispatch
-def _lowrank(coder: LowRankGaussianLikelihood, xz: AggregateInput, z: Aggregate):
+def _lowrank(
+    coder: LowRankGaussianLikelihood,
+    xz: AggregateInput,
+    z: Aggregate,
+    dtype_lik,
+):
     means, var_factors, noises, shapes = zip(
-        *[_lowrank(coder, xzi, zi) for (xzi, _), zi in zip(xz, z)]
+        *[_lowrank(coder, xzi, zi, dtype_lik) for (xzi, _), zi in zip(xz, z)]
     )
 
     # Concatenate into one big Gaussian.
@@ -209,13 +247,17 @@ def _lowrank(coder: LowRankGaussianLikelihood, xz: AggregateInput, z: Aggregate)
 
 
 @_dispatch
-def _lowrank(coder: LowRankGaussianLikelihood, xz, z: B.Numeric):
+def _lowrank(coder: LowRankGaussianLikelihood, xz, z: B.Numeric, dtype_lik):
     d = data_dims(xz)
-
     dim_y = B.shape(z, -d - 1) // (2 + coder.rank)
-    dim_inner = B.shape(z, -d - 1) - 2 * dim_y
 
     z_mean, z_var_factor, z_noise = split(z, (dim_y, coder.rank * dim_y, dim_y), -d - 1)
+    # Intuitively, roughly `var_factor ** 2` summed along the columns will determine the
+    # output variances. We divide by the number of columns to stabilise this. The number
+    # of columns is just the rank, so there is no need to read it off the shape. Scale
+    # whilst the factor is still contiguous: the reshapes and the transpose below can
+    # then all be views.
+    z_var_factor = z_var_factor / coder.rank
     # Split of the ranks of the factor.
     z_var_factor = split_dimension(z_var_factor, -d - 1, (coder.rank, dim_y))
 
@@ -230,11 +272,8 @@ def _lowrank(coder: LowRankGaussianLikelihood, xz, z: B.Numeric):
 
     # Transform into parameters.
     mean = z_mean
-    # Intuitively, roughly `var_factor ** 2` summed along the columns will determine the
-    # output variances. We divide by the square root of the number of columns to
-    # stabilise this.
-    var_factor = z_var_factor / B.shape(z_var_factor, -1)
-    noise = coder.epsilon + B.softplus(z_noise)
+    var_factor = z_var_factor
+    noise = softplus_noise(z_noise, coder.epsilon, dtype_lik)
 
     return mean, var_factor, noise, shape
 
@@ -275,13 +314,12 @@ def code(
 ):
     z_mean_noise, z_var = z
 
-    mean, var, noise, shape = _dense(coder, *xz, *z)
+    mean, var, noise, shape = _dense(coder, *xz, *z, dtype_lik)
 
-    # Cast parameters to the right data type.
-    if dtype_lik:
-        mean = B.cast(dtype_lik, mean)
-        var = B.cast(dtype_lik, var)
-        noise = B.cast(dtype_lik, noise)
+    # Cast parameters to the right data type. The noise has already been cast by the
+    # fused noise transform.
+    mean = _maybe_cast(dtype_lik, mean)
+    var = _maybe_cast(dtype_lik, var)
 
     # Return the inputs for the mean. The inputs for the variance will have been
     # duplicated.
@@ -297,8 +335,9 @@ def _dense(
     xz_var,
     z_mean: B.Numeric,
     z_var: B.Numeric,
+    dtype_lik,
 ):
-    mean, noise, shape = _dense_mean(coder, xz_mean, z_mean)
+    mean, noise, shape = _dense_mean(coder, xz_mean, z_mean, dtype_lik)
     var = _dense_var(coder, xz_var, z_var)
     return mean, var, noise, shape
 
@@ -310,9 +349,13 @@ def _dense(
     xz_var: AggregateInput,
     z_mean: Aggregate,
     z_var: Aggregate,
+    dtype_lik,
 ):
     means, noises, shapes = zip(
-        *[_dense_mean(coder, xzi, zi) for (xzi, _), zi in zip(xz_mean, z_mean)]
+        *[
+            _dense_mean(coder, xzi, zi, dtype_lik)
+            for (xzi, _), zi in zip(xz_mean, z_mean)
+        ]
     )
     vars = [
         [_dense_var(coder, xzij, zij) for (xzij, _), zij in zip(xzi, zi)]
@@ -329,7 +372,7 @@ def _dense(
 
 
 @_dispatch
-def _dense_mean(coder: DenseGaussianLikelihood, xz, z: B.Numeric):
+def _dense_mean(coder: DenseGaussianLikelihood, xz, z: B.Numeric, dtype_lik):
     d = data_dims(xz)
     dim_y = B.shape(z, -d - 1) // 2
 
@@ -341,7 +384,7 @@ def _dense_mean(coder: DenseGaussianLikelihood, xz, z: B.Numeric):
 
     # Transform into parameters.
     mean = z_mean
-    noise = coder.epsilon + B.softplus(z_noise)
+    noise = softplus_noise(z_noise, coder.epsilon, dtype_lik)
 
     return mean, noise, shape
 
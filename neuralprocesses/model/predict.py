@@ -2,11 +2,55 @@ import lab as B
 import numpy as np
 
 from .model import Model
+from .util import compress_contexts, sample
 from .. import _dispatch
+from ..coding import code
+from ..dist import Dirac
+from ..parallel import Parallel
 
 __all__ = ["predict"]
 
 
+def _identity(x):
+    return x
+
+
+@_dispatch
+def _distribute_samples(xt, num_samples: B.Int):
+    """Shard the production of samples over distributed workers.
+
+    The fallback implementation performs no sharding. The PyTorch backend registers
+    an implementation which splits the samples over the workers of a
+    `torch.distributed` run.
+
+    Args:
+        xt (input): Inputs of the target set, used to determine the backend.
+        num_samples (int): Total number of samples to produce.
+
+    Returns:
+        int: Number of samples to produce in this process.
+        int: Total number of samples produced over all processes.
+        function: Function which gathers batches of samples from all processes.
+        function: Function which sums moment statistics over all processes.
+    """
+    return num_samples, num_samples, _identity, _identity
+
+
+@_dispatch
+def _determ_enc(pz: Parallel):
+    return all(_determ_enc(pzi) for pzi in pz)
+
+
+@_dispatch
+def _determ_enc(pz: Dirac):
+    return True
+
+
+@_dispatch
+def _determ_enc(pz):
+    return False
+
+
 @_dispatch
 def predict(
     state: B.RandomState,
@@ -16,6 +60,7 @@ def predict(
     *,
     num_samples=50,
     batch_size=16,
+    dtype_lik=None,
 ):
     """Use a model to predict.
 
@@ -27,6 +72,10 @@ def predict(
         xt (input): Inputs of the target set.
         num_samples (int, optional): Number of samples to produce. Defaults to 50.
         batch_size (int, optional): Batch size. Defaults to 16.
+        dtype_lik (dtype, optional): Data type to run the likelihood in. Defaults to
+            the `float64` variant of the data type of `xt`, which eases the numerics
+            as much as possible. Set this to a lower-precision data type, e.g.
+            `float32`, to trade numerical stability for speed and memory.
 
     Returns:
         random state, optional: Random state.
@@ -36,62 +85,83 @@ def predict(
         tensor: `num_samples` noisy samples.
     """
     float = B.dtype_float(xt)
-    float64 = B.promote_dtypes(float, np.float64)
+    # Run the likelihood with `float64`s to ease the numerics as much as possible,
+    # unless the caller asked for a specific data type.
+    dtype_lik = dtype_lik or B.promote_dtypes(float, np.float64)
 
-    # Collect noiseless samples, noisy samples, first moments, and second moments.
+    # Collect noiseless samples and noisy samples, and maintain running sums of the
+    # first and second moments. The running sums avoid keeping the moments of every
+    # batch alive until the end.
     ft, yt = [], []
-    m1s, m2s = [], []
+    m1_sum, m2_sum = None, None
+
+    # Encode the context set once. The encoding does not depend on the samples, so
+    # the encoder need not be re-run for every batch of samples.
+    xc, yc = compress_contexts(contexts)
+    xz, pz = code(model.encoder, xc, yc, xt, root=True, dtype_lik=dtype_lik)
+
+    # If the encoding consists of `Dirac`s only, then there is no need to batch: one
+    # decoder pass suffices, and we can efficiently compute everything that we need
+    # and exit. This can be determined from the encoding directly, without performing
+    # a sacrificial forward pass to probe the shape of the prediction.
+    if num_samples > 1 and _determ_enc(pz):
+        state, z = sample(state, pz, num=1)
+        z = B.cast(float, z)
+        _, pred = code(model.decoder, xz, z, xt, root=True, dtype_lik=dtype_lik)
+        state, ft = pred.noiseless.sample(state, num_samples)
+        state, yt = pred.sample(state, num_samples)
+        return (
+            state,
+            # Squeeze the newly introduced sample dimension.
+            B.squeeze(pred.mean, axis=0),
+            B.squeeze(pred.var, axis=0),
+            # Squeeze the previously introduced sample dimension.
+            B.squeeze(ft, axis=1),
+            B.squeeze(yt, axis=1),
+        )
+
+    # A distributed backend may shard the samples over multiple workers, since the
+    # batches of samples are independent. In that case, every worker produces an
+    # equally sized shard, and the shards are gathered at the end.
+    local_num_samples, total_num_samples, gather, reduce_sum = _distribute_samples(
+        xt, num_samples
+    )
 
     done_num_samples = 0
-    while done_num_samples < num_samples:
+    while done_num_samples < local_num_samples:
         # Limit the number of samples at the batch size.
-        this_num_samples = min(num_samples - done_num_samples, batch_size)
-
-        state, pred = model(
-            state,
-            contexts,
-            xt,
-            dtype_enc_sample=float,
-            # Run likelihood with `float64`s to ease the numerics as much as possible.
-            dtype_lik=float64,
-            num_samples=this_num_samples,
-        )
+        this_num_samples = min(local_num_samples - done_num_samples, batch_size)
 
-        # If the number of samples is equal to one but `num_samples > 1`, then the
-        # encoding was a `Dirac`, so we can stop batching. In this case, we can
-        # efficiently compute everything that we need and exit.
-        if this_num_samples > 1 and B.shape_batch(pred, 0) == 1:
-            state, ft = pred.noiseless.sample(state, num_samples)
-            state, yt = pred.sample(state, num_samples)
-            return (
-                state,
-                # Squeeze the newly introduced sample dimension.
-                B.squeeze(pred.mean, axis=0),
-                B.squeeze(pred.var, axis=0),
-                # Squeeze the previously introduced sample dimension.
-                B.squeeze(ft, axis=1),
-                B.squeeze(yt, axis=1),
-            )
+        # Sample the encoding, convert the sample to the right data type, and decode.
+        state, z = sample(state, pz, num=this_num_samples)
+        z = B.cast(float, z)
+        _, pred = code(model.decoder, xz, z, xt, root=True, dtype_lik=dtype_lik)
 
         # Produce samples.
-        state, sample = pred.noiseless.sample(state)
-        ft.append(sample)
-        state, sample = pred.sample(state)
-        yt.append(sample)
+        state, this_ft = pred.noiseless.sample(state)
+        ft.append(this_ft)
+        state, this_yt = pred.sample(state)
+        yt.append(this_yt)
 
-        # Produce moments.
-        m1s.append(pred.mean)
-        m2s.append(B.add(pred.var, B.multiply(m1s[-1], m1s[-1])))
+        # Accumulate moments.
+        m1 = B.sum(pred.mean, axis=0)
+        m2 = B.sum(B.add(pred.var, B.multiply(pred.mean, pred.mean)), axis=0)
+        m1_sum = m1 if m1_sum is None else B.add(m1_sum, m1)
+        m2_sum = m2 if m2_sum is None else B.add(m2_sum, m2)
 
         done_num_samples += this_num_samples
 
-    # Stack samples.
-    ft = B.concat(*ft, axis=0)
-    yt = B.concat(*yt, axis=0)
+    # Stack samples. If there was only one batch of samples, the concatenation would
+    # copy the batch, so just take the batch in that case. Equally sized shards may
+    # together exceed `num_samples`, so trim the excess after gathering.
+    ft = ft[0] if len(ft) == 1 else B.concat(*ft, axis=0)
+    yt = yt[0] if len(yt) == 1 else B.concat(*yt, axis=0)
+    ft = gather(ft)[:num_samples]
+    yt = gather(yt)[:num_samples]
 
     # Compute marginal statistics.
-    m1 = B.mean(B.concat(*m1s, axis=0), axis=0)
-    m2 = B.mean(B.concat(*m2s, axis=0), axis=0)
+    m1 = B.divide(reduce_sum(m1_sum), total_num_samples)
+    m2 = B.divide(reduce_sum(m2_sum), total_num_samples)
     mean, var = m1, B.subtract(m2, B.multiply(m1, m1))
 
     return state, mean, var, ft, yt
@@ -1,3 +1,5 @@
+import inspect
+
 import lab.tensorflow  # noqa
 from plum import convert
 
@@ -15,10 +17,26 @@ def create_init(module):
 
 
 def create_tf_call(module):
-    def call(self, *args, training=False, **kw_args):
-        try:
+    # Resolve once at class-creation time whether the module's `__call__` accepts a
+    # `training` argument. Doing this with a try-except at every call would raise
+    # and catch a `TypeError` per forward pass for most modules, which also
+    # interferes with `tf.function` tracing.
+    try:
+        params = inspect.signature(module.__call__).parameters
+        accepts_training = "training" in params or any(
+            p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values()
+        )
+    except (TypeError, ValueError):
+        accepts_training = True
+
+    if accepts_training:
+
+        def call(self, *args, training=False, **kw_args):
             return module.__call__(self, *args, training=training, **kw_args)
-        except TypeError:
+
+    else:
+
+        def call(self, *args, training=False, **kw_args):
             return module.__call__(self, *args, **kw_args)
 
     return call
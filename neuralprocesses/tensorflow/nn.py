@@ -8,6 +8,7 @@ from plum import convert
 
 import neuralprocesses as nps
 from .. import _dispatch
+from ..likelihood import softplus_noise
 from ..util import compress_batch_dimensions, is_framework_module
 
 __all__ = ["num_params", "Module"]
@@ -19,6 +20,21 @@ def is_framework_module(x: Union[tf.keras.Model, tf.keras.layers.Layer]):
     return True
 
 
+@tf.function(jit_compile=True)
+def _softplus_noise_fused(z, epsilon):
+    return tf.nn.softplus(z) + epsilon
+
+
+@softplus_noise.dispatch
+def softplus_noise(z: B.TFNumeric, epsilon: float, dtype_lik):
+    # XLA fuses the softplus and the addition of `epsilon` into one kernel. The
+    # cast stays outside of the compiled function to avoid retracing per data type.
+    noise = _softplus_noise_fused(z, tf.constant(epsilon, dtype=z.dtype))
+    if dtype_lik and B.dtype(noise) != dtype_lik:
+        noise = B.cast(dtype_lik, noise)
+    return noise
+
+
 @_dispatch
 def num_params(model: tf.keras.Model):
     """Get the number of parameters.
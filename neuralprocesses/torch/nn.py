@@ -9,7 +9,9 @@ from wbml.util import inv_perm
 
 import neuralprocesses as nps
 from .. import _dispatch
-from ..util import is_framework_module
+from ..likelihood import softplus_noise
+from ..model.predict import _distribute_samples, _identity
+from ..util import compile_module, is_framework_module
 
 __all__ = ["num_params", "Module"]
 
@@ -20,6 +22,68 @@ def is_framework_module(x: torch.nn.Module):
     return True
 
 
+@compile_module.dispatch
+def compile_module(module: torch.nn.Module, backend: str):
+    # `torch.compile` is only available from PyTorch 2 onwards.
+    if not hasattr(torch, "compile"):
+        return module
+    # Since the shapes are quantised, it pays off to let cuDNN benchmark the
+    # available convolution algorithms and cache the fastest one per shape.
+    torch.backends.cudnn.benchmark = True
+    # Compile the forward pass in place rather than wrapping the module, so that the
+    # module keeps its type for dispatch purposes. Since inputs are typically padded
+    # to multiples of a power of two, shapes are quantised, so let the compiler
+    # specialise on static shapes and cache a graph per shape bucket.
+    module.forward = torch.compile(
+        module.forward,
+        backend=backend,
+        dynamic=False,
+        fullgraph=False,
+    )
+    return module
+
+
+@_distribute_samples.dispatch
+def _distribute_samples(xt: B.TorchNumeric, num_samples: B.Int):
+    dist = torch.distributed
+    if not (dist.is_available() and dist.is_initialized()):
+        return num_samples, num_samples, _identity, _identity
+    world_size = dist.get_world_size()
+    if world_size == 1:
+        return num_samples, num_samples, _identity, _identity
+
+    # Give every worker an equally sized shard, so that the shards can be gathered
+    # with `all_gather`. The shards may then together exceed `num_samples`, which
+    # the caller must account for.
+    local_num_samples = -(-num_samples // world_size)
+    total_num_samples = local_num_samples * world_size
+
+    def gather(x):
+        xs = [torch.empty_like(x) for _ in range(world_size)]
+        dist.all_gather(xs, x.contiguous())
+        return torch.cat(xs, dim=0)
+
+    def reduce_sum(x):
+        x = x.clone()
+        dist.all_reduce(x, op=dist.ReduceOp.SUM)
+        return x
+
+    return local_num_samples, total_num_samples, gather, reduce_sum
+
+
+@torch.jit.script
+def _softplus_noise_fused(z, epsilon: float, dtype: torch.dtype):
+    return (torch.nn.functional.softplus(z) + epsilon).to(dtype)
+
+
+@softplus_noise.dispatch
+def softplus_noise(z: B.TorchNumeric, epsilon: float, dtype_lik):
+    # The scripted version fuses the softplus, the addition of `epsilon`, and the
+    # cast into a single elementwise kernel.
+    dtype = convert(dtype_lik, B.TorchDType) if dtype_lik else z.dtype
+    return _softplus_noise_fused(z, epsilon, dtype)
+
+
 @_dispatch
 def num_params(model: torch.nn.Module):
     """Get the number of parameters.
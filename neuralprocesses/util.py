@@ -2,12 +2,12 @@ from functools import wraps
 
 import lab as B
 import numpy as np
-from lab.util import resolve_axis
 
 from . import _dispatch
 
 __all__ = [
     "is_framework_module",
+    "compile_module",
     "modules",
     "register_module",
     "models",
@@ -40,6 +40,22 @@ def is_framework_module(x):
     return False
 
 
+@_dispatch
+def compile_module(module, backend: str):
+    """Compile a module with the framework's JIT compiler, if one is available.
+
+    The fallback behaviour is to return `module` unchanged.
+
+    Args:
+        module (module): Module to compile.
+        backend (str): Compiler backend.
+
+    Returns:
+        module: Compiled version of `module`.
+    """
+    return module
+
+
 modules = []  #: Registered modules
 
 
@@ -157,8 +173,10 @@ def split(z, sizes, axis):
         list[tensor]: Components of the split.
     """
 
-    axis = resolve_axis(z, axis)
-    index = [slice(None, None, None)] * B.rank(z)
+    # Only query the shape once: these reshaping utilities are called in hot paths.
+    rank = len(B.shape(z))
+    axis = axis % rank
+    index = [slice(None, None, None)] * rank
 
     components = []
     i = 0
@@ -183,7 +201,7 @@ def split_dimension(z, axis, sizes):
     """
     shape = B.shape(z)
     # The indexing below will only be correct for positive `axis`, so resolve the index.
-    axis = resolve_axis(z, axis)
+    axis = axis % len(shape)
     return B.reshape(z, *shape[:axis], *sizes, *shape[axis + 1 :])
 
 
@@ -201,7 +219,7 @@ def merge_dimensions(z, axis, sizes):
     """
     shape = B.shape(z)
     # The indexing below will only be correct for positive `axis`, so resolve the index.
-    axis = resolve_axis(z, axis)
+    axis = axis % len(shape)
     return B.reshape(
         z,
         *shape[: axis - len(sizes) + 1],
@@ -221,10 +239,11 @@ def select(z, i, axis):
     Returns:
         tensor: Selection from `z`.
     """
-    axis = resolve_axis(z, axis)
-    index = [slice(None, None, None) for _ in range(B.rank(z))]
+    rank = len(B.shape(z))
+    axis = axis % rank
+    index = [slice(None, None, None)] * rank
     index[axis] = slice(i, i + 1, None)
-    return z[index]
+    return z[tuple(index)]
 
 
 def with_first_last(xs):
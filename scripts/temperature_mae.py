@@ -51,18 +51,34 @@ def reindex(mae, xt):
 for name, gen in exp["gens_eval"]():
     with out.Section(name):
         state = B.create_random_state(torch.float32, seed=0)
-        maes = []
-
-        with torch.no_grad():
+        # Stream the per-station sums and counts instead of keeping the MAEs of
+        # every batch alive and concatenating at the end.
+        mae_sum, mae_count = 0, 0
+
+        # `inference_mode` is slightly cheaper than `no_grad`, because it also skips
+        # view and version tracking. On the GPU, additionally run the model in
+        # `bfloat16`, which roughly halves the memory traffic of the convolutions.
+        # The error computation below remains in full precision.
+        device_type = "cuda" if any(p.is_cuda for p in model.parameters()) else "cpu"
+        with torch.inference_mode(), torch.autocast(
+            device_type=device_type,
+            dtype=torch.bfloat16,
+            enabled=device_type == "cuda",
+        ):
             for batch in gen.epoch():
                 state, pred = model(state, batch["contexts"], batch["xt"])
-                mae = B.abs(pred.mean - batch["yt"])
-                maes.append(reindex(mae, batch["xt"]))
-        maes = B.concat(*maes)
+                mae = B.abs(B.cast(torch.float32, pred.mean) - batch["yt"])
+                mae = reindex(mae, batch["xt"])
+                valid = ~B.isnan(mae)
+                # `nan_to_num` zeroes out the missing entries in a single pass,
+                # without materialising a separate tensor of zeroes.
+                mae_sum = mae_sum + B.sum(torch.nan_to_num(mae), axis=(0, 1))
+                mae_count = mae_count + B.sum(B.cast(B.dtype(mae), valid), axis=(0, 1))
 
         # Compute the average MAE per station, and then take the median over
-        # stations. This lines up with the VALUE protocol.
-        maes = B.nanmean(maes, axis=(0, 1))
+        # stations. This lines up with the VALUE protocol. Stations without any
+        # observations give a zero count and hence a NaN.
+        maes = mae_sum / mae_count
 
         out.kv("Station-wise MAEs", maes)
         out.kv("MAE", experiment.with_err(maes[~B.isnan(maes)]))
@@ -0,0 +1,12 @@
+import os
+
+# When running under `pytest-xdist`, every worker would otherwise spin up a full
+# intra-op thread pool, oversubscribing the machine. Limit every worker to a single
+# thread. The environment variables must be set before the frameworks are imported.
+if "PYTEST_XDIST_WORKER" in os.environ:
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", "1")
+
+    import torch
+
+    torch.set_num_threads(1)
@@ -13,7 +13,10 @@ def test_convgnp_auxiliary_variable(nps):
         dim_aux_t=4,
         dim_yt=3,
         num_basis_functions=16,
-        points_per_unit=16,
+        points_per_unit=8,
+        # The test only checks the plumbing of the auxiliary variables, so a small
+        # UNet suffices.
+        unet_channels=(4, 8),
         likelihood="lowrank",
     )
 
@@ -25,3 +25,26 @@ def test_discretisation(nps):
     overshoot_left = (0.1 - 0.05) - B.min(grid)
     overshoot_right = B.max(grid) - (0.6 + 0.05)
     assert B.abs(overshoot_left - overshoot_right) <= 1 / 33
+
+
+def test_discretisation_cache(nps):
+    disc = nps.Discretisation(points_per_unit=33, multiple=5, margin=0.05, cache_size=2)
+
+    x1 = B.linspace(nps.dtype, 0.1, 0.5, 10)[None, None, :]
+    x2 = B.linspace(nps.dtype, 0.2, 0.6, 15)[None, None, :]
+
+    grid = disc(x1, x2)
+
+    # Perturbing the inputs by much less than the resolution must reuse the grid.
+    grid2 = disc(x1 + 1e-6, x2 + 1e-6)
+    assert grid2 is grid
+
+    # Sufficiently different inputs must produce a different grid.
+    grid3 = disc(x1 + 1, x2 + 1)
+    assert grid3 is not grid
+    approx(grid3, grid + 1, atol=1e-6)
+
+    # The cache must not grow beyond its size.
+    disc(x1 - 1, x2 - 1)
+    disc(x1 - 2, x2 - 2)
+    assert len(disc._cache) == 2
@@ -17,6 +17,11 @@ _dispatch = Dispatcher()
 B.epsilon = 1e-6
 B.cholesky_retry_factor = 1e4
 
+# Seed all random number generators once, so a run of the suite is reproducible.
+# Flaky reruns still advance the state and hence resample, which is what gets a
+# rerun past a bad draw.
+B.set_random_seed(0)
+
 
 @_dispatch
 def approx(a, b, **kw_args):
@@ -49,6 +54,11 @@ nps_tf.dtype = tf.float32
 nps_tf.dtype32 = tf.float32
 nps_tf.dtype64 = tf.float64
 
+# Tag the namespaces with their backend, so tests can branch on a simple string
+# comparison instead of dispatching on the data type in every case.
+nps_torch.backend = "torch"
+nps_tf.backend = "tf"
+
 
 @pytest.fixture(params=[nps_torch, nps_tf], scope="module")
 def nps(request):